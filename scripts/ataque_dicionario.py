@@ -3,6 +3,7 @@ import time
 
 import pandas as pd
 from automato_parser import Automaton, parse_jff
+from instrumentacao import Instrumentation
 
 
 class AtaqueDicionario:
@@ -10,12 +11,18 @@ class AtaqueDicionario:
         self.resultados_dir = resultados_dir
         os.makedirs(self.resultados_dir, exist_ok=True)
 
-    def executar_ataque(self, nome_politica, dicionario_path, automato_path):
+    def executar_ataque(
+        self, nome_politica, dicionario_path, automato_path, instrumentacao=None
+    ):
         print(
             f"Iniciando ataque de dicionário para a política '{nome_politica}' com o dicionário '{dicionario_path}'..."
         )
 
-        automato = parse_jff(automato_path)
+        if instrumentacao is None:
+            instrumentacao = Instrumentation()
+        instrumentacao.start()
+        with instrumentacao.phase("parse"):
+            automato = parse_jff(automato_path)
 
         if automato is None:
             print(
@@ -26,16 +33,48 @@ class AtaqueDicionario:
         senhas_testadas = []
         senhas_aceitas = []
 
+        # `accepts` é cronometrado por amostragem; o resto do laço (leitura do
+        # arquivo, strip, listas) fica na fase "read".
+        accepts = automato.accepts
+        perf_counter = time.perf_counter
+        sample_every = instrumentacao.sample_every
+        proximo_checkpoint = instrumentacao.next_check
+        testadas = aceitas = 0
+        limite_de_tempo_atingido = False
+
         start_time = time.time()
+        loop_start = perf_counter()
 
         with open(dicionario_path, "r", encoding="utf-8", errors="ignore") as f:
             for line in f:
                 senha = line.strip()
                 senhas_testadas.append(senha)
-                if automato.accepts(senha):
+                testadas += 1
+                if testadas % sample_every:
+                    aceita = accepts(senha)
+                else:
+                    sample_start = perf_counter()
+                    aceita = accepts(senha)
+                    instrumentacao.sample("accept", perf_counter() - sample_start)
+                if aceita:
                     senhas_aceitas.append(senha)
+                    aceitas += 1
+                if testadas >= proximo_checkpoint:
+                    if instrumentacao.checkpoint(testadas, accepted=aceitas):
+                        print(
+                            f"Limite de tempo ({instrumentacao.time_limit_seconds}s) "
+                            f"atingido para a política '{nome_politica}'."
+                        )
+                        limite_de_tempo_atingido = True
+                        break
+                    proximo_checkpoint = instrumentacao.next_check
 
         end_time = time.time()
+        loop_seconds = perf_counter() - loop_start
+        instrumentacao.update_counters(testadas, accepted=aceitas)
+        instrumentacao.finish()
+        accept_seconds = instrumentacao.extrapolate_samples({"accept": testadas})
+        instrumentacao.add_phase_time("read", max(loop_seconds - accept_seconds, 0.0))
         tempo_total = end_time - start_time
 
         total_senhas_testadas = len(senhas_testadas)
@@ -59,7 +98,9 @@ class AtaqueDicionario:
             "total_senhas_aceitas": total_senhas_aceitas,
             "taxa_sucesso": taxa_sucesso,
             "tempo_total_segundos": tempo_total,
+            "limite_de_tempo_atingido": limite_de_tempo_atingido,
         }
+        resultados.update(instrumentacao.summary())
 
         return resultados
 
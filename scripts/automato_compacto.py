@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+automato_compacto.py
+
+Representação compacta (struct-of-arrays) de autômatos determinísticos, para
+autômatos gerados com centenas de milhares de estados.
+
+Exemplos de Uso:
+    # Compila um .jff para o formato binário compacto
+    python3 automato_compacto.py ../automatos/forte.jff forte.cdfa
+
+    # Compila e testa senhas com o autômato carregado do arquivo binário
+    python3 automato_compacto.py ../automatos/forte.jff forte.cdfa --test "Senha@123" "abc"
+
+    # Confere o round-trip gravar/carregar dos dois layouts contra o Automaton original
+    python3 automato_compacto.py ../automatos/forte.jff forte.cdfa --verificar ../dicionarios/10k.txt
+
+Em vez de objetos `State`/`Transition`, o autômato é guardado em arrays int32
+contíguos:
+ - `alphabet`/`classes`: cada caractere do alfabeto aponta para uma classe de
+   equivalência (caracteres que se comportam igual em todas as transições);
+ - layout "dense": tabela `num_states x num_classes` com o próximo estado
+   (-1 = rejeita);
+ - layout "csr": linhas esparsas `row_ptr`/`symbols`/`targets` para quando a
+   tabela densa seria quase toda vazia (alfabetos grandes);
+ - `finals`: bitset com os estados finais.
+O arquivo binário é só um cabeçalho seguido desses arrays, então carregar não
+cria nenhum objeto Python por estado.
+"""
+
+import argparse
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from automato_parser import parse_jff
+
+# Alfabeto padrão: ASCII imprimível (espaço até '~').
+DEFAULT_ALPHABET = "".join(chr(c) for c in range(32, 127))
+
+MAGIC = b"CDFA"
+VERSION = 1
+HEADER = struct.Struct("<4sBBxxiiiii")
+LAYOUTS = ("dense", "csr")
+
+# Abaixo desta densidade (transições definidas / células da tabela densa) o
+# layout "auto" escolhe CSR.
+DENSE_MIN_DENSITY = 0.25
+
+
+def _int32_array(values=()):
+    return array("i", values)
+
+
+def _as_int32_array(values):
+    if isinstance(values, array) and values.typecode == "i":
+        return values
+    return _int32_array(values)
+
+
+def _finals_size(num_states):
+    return (num_states + 7) // 8
+
+
+def _check_range(name, values, low, high):
+    if values and not (low <= min(values) and max(values) < high):
+        raise ValueError(
+            f"{name} deve estar em [{low}, {high}), mas vai de {min(values)} "
+            f"a {max(values)}."
+        )
+
+
+def _check_csr(num_states, num_classes, row_ptr, symbols, targets):
+    if len(row_ptr) != num_states + 1:
+        raise ValueError(
+            f"row_ptr deve ter num_states + 1 = {num_states + 1} entradas, "
+            f"tem {len(row_ptr)}."
+        )
+    if row_ptr[0] != 0:
+        raise ValueError(f"row_ptr deve começar em 0, começa em {row_ptr[0]}.")
+    if any(a > b for a, b in zip(row_ptr, row_ptr[1:])):
+        raise ValueError("row_ptr deve ser não decrescente.")
+    if not len(symbols) == len(targets) == row_ptr[-1]:
+        raise ValueError(
+            f"symbols ({len(symbols)}) e targets ({len(targets)}) devem ter "
+            f"row_ptr[-1] = {row_ptr[-1]} entradas."
+        )
+    _check_range("symbols", symbols, 0, num_classes)
+    _check_range("targets", targets, -1, num_states)
+    # Dentro de cada linha os símbolos são estritamente crescentes (a busca
+    # binária em `accepts` depende disso); só o início de uma linha pode cair.
+    row_starts = set(row_ptr)
+    for i in range(1, len(symbols)):
+        if symbols[i] <= symbols[i - 1] and i not in row_starts:
+            raise ValueError(
+                f"symbols deve ser estritamente crescente em cada linha "
+                f"(posição {i})."
+            )
+
+
+class CompactAutomaton:
+    def __init__(
+        self,
+        alphabet,
+        classes,
+        num_classes,
+        initial_state,
+        finals,
+        num_states,
+        row_ptr=None,
+        symbols=None,
+        targets=None,
+        table=None,
+    ):
+        """
+        Prefira `from_automaton`, `from_csr` ou `load`; o construtor só recebe
+        os arrays já prontos de um dos dois layouts (`table` ou CSR). Tamanhos
+        e valores (classes, símbolos e destinos dentro do intervalo, linhas CSR
+        ordenadas) são conferidos aqui e levantam ValueError se não baterem.
+        """
+        finals = bytearray(finals)
+        if len(finals) != _finals_size(num_states):
+            raise ValueError(
+                f"finals deve ser um bitset de (num_states + 7) // 8 = "
+                f"{_finals_size(num_states)} bytes, tem {len(finals)}."
+            )
+        if len(classes) != len(alphabet):
+            raise ValueError(
+                f"classes ({len(classes)}) deve ter uma entrada por caractere "
+                f"do alfabeto ({len(alphabet)})."
+            )
+        _check_range("classes", classes, 0, num_classes)
+        if not -1 <= initial_state < num_states:
+            raise ValueError(f"Estado inicial fora do intervalo: {initial_state}.")
+        if table is not None:
+            table = _as_int32_array(table)
+            if len(table) != num_states * num_classes:
+                raise ValueError(
+                    f"table deve ter num_states * num_classes = "
+                    f"{num_states * num_classes} entradas, tem {len(table)}."
+                )
+            _check_range("table", table, -1, num_states)
+        else:
+            row_ptr = _as_int32_array(row_ptr)
+            symbols = _as_int32_array(symbols)
+            targets = _as_int32_array(targets)
+            _check_csr(num_states, num_classes, row_ptr, symbols, targets)
+
+        self.alphabet = alphabet
+        self.classes = _as_int32_array(classes)
+        self.num_classes = num_classes
+        self.initial_state = initial_state
+        self.finals = finals
+        self.num_states = num_states
+        self.row_ptr = row_ptr
+        self.symbols = symbols
+        self.targets = targets
+        self.table = table
+        self.layout = "dense" if table is not None else "csr"
+        self._class_of = dict(zip(alphabet, classes))
+
+    @classmethod
+    def from_csr(
+        cls,
+        alphabet,
+        classes,
+        num_classes,
+        initial_state,
+        finals,
+        row_ptr,
+        symbols,
+        targets,
+        layout="auto",
+    ):
+        """
+        Monta o autômato a partir de linhas CSR: os símbolos (classes) do
+        estado `s` ficam em `symbols[row_ptr[s]:row_ptr[s + 1]]`, ordenados,
+        com o destino correspondente em `targets`. `classes[i]` é a classe do
+        caractere `alphabet[i]`.
+
+        `finals` é um bitset little-endian de `(num_states + 7) // 8` bytes:
+        o estado `s` é final se o bit `s & 7` do byte `s >> 3` estiver ligado
+        (é convertido para `bytearray`). Tamanhos ou valores inconsistentes
+        levantam ValueError. `layout` pode ser "dense", "csr" ou "auto"
+        (decide pela densidade).
+        """
+        num_states = len(row_ptr) - 1
+        _check_csr(num_states, num_classes, row_ptr, symbols, targets)
+        if layout == "auto":
+            cells = num_states * num_classes
+            density = len(symbols) / cells if cells else 1.0
+            layout = "dense" if density >= DENSE_MIN_DENSITY else "csr"
+        if layout not in LAYOUTS:
+            raise ValueError(f"Layout desconhecido: {layout!r}")
+        if layout == "csr":
+            return cls(
+                alphabet,
+                classes,
+                num_classes,
+                initial_state,
+                finals,
+                num_states,
+                row_ptr=row_ptr,
+                symbols=symbols,
+                targets=targets,
+            )
+        table = _int32_array([-1]) * (num_states * num_classes)
+        for state in range(num_states):
+            base = state * num_classes
+            for i in range(row_ptr[state], row_ptr[state + 1]):
+                table[base + symbols[i]] = targets[i]
+        return cls(
+            alphabet,
+            classes,
+            num_classes,
+            initial_state,
+            finals,
+            num_states,
+            table=table,
+        )
+
+    @classmethod
+    def from_automaton(cls, automaton, alphabet=DEFAULT_ALPHABET, layout="auto"):
+        """
+        Determiniza um `Automaton` (construção de subconjuntos sobre classes de
+        equivalência do alfabeto). Transições épsilon são ignoradas, como em
+        `Automaton.accepts`; caracteres fora de `alphabet` são rejeitados.
+        """
+        transitions = [
+            t for t in automaton.transitions if t.compiled_pattern is not None
+        ]
+
+        # Classes de equivalência: caracteres casados exatamente pelas mesmas
+        # transições viram um único símbolo.
+        class_by_signature = {}
+        class_alphabet = []
+        class_ids = []
+        for char in alphabet:
+            signature = tuple(
+                i
+                for i, t in enumerate(transitions)
+                if t.compiled_pattern.fullmatch(char)
+            )
+            if not signature:
+                continue
+            class_alphabet.append(char)
+            class_ids.append(
+                class_by_signature.setdefault(signature, len(class_by_signature))
+            )
+        num_classes = len(class_by_signature)
+
+        # moves[estado][classe] -> estados destino no autômato original
+        moves = {}
+        for signature, symbol in class_by_signature.items():
+            for i in signature:
+                t = transitions[i]
+                moves.setdefault(t.from_state, {}).setdefault(symbol, set()).add(
+                    t.to_state
+                )
+
+        final_ids = {s.id for s in automaton.final_states}
+        row_ptr = _int32_array([0])
+        symbols = _int32_array()
+        targets = _int32_array()
+        final_flags = []
+        if automaton.initial_state is None:
+            initial_state = -1
+        else:
+            start = frozenset([automaton.initial_state.id])
+            initial_state = 0
+            index_of = {start: 0}
+            pending = [start]
+            # Os estados são processados na ordem em que recebem índice, então
+            # cada linha CSR é anexada já na posição certa.
+            for subset in pending:
+                final_flags.append(not final_ids.isdisjoint(subset))
+                for symbol in range(num_classes):
+                    next_subset = set()
+                    for state_id in subset:
+                        next_subset.update(moves.get(state_id, {}).get(symbol, ()))
+                    if not next_subset:
+                        continue
+                    next_subset = frozenset(next_subset)
+                    if next_subset not in index_of:
+                        index_of[next_subset] = len(pending)
+                        pending.append(next_subset)
+                    symbols.append(symbol)
+                    targets.append(index_of[next_subset])
+                row_ptr.append(len(symbols))
+
+        finals = bytearray((len(final_flags) + 7) // 8)
+        for state, is_final in enumerate(final_flags):
+            if is_final:
+                finals[state >> 3] |= 1 << (state & 7)
+
+        return cls.from_csr(
+            "".join(class_alphabet),
+            _int32_array(class_ids),
+            num_classes,
+            initial_state,
+            finals,
+            row_ptr,
+            symbols,
+            targets,
+            layout=layout,
+        )
+
+    def is_final(self, state):
+        return bool(self.finals[state >> 3] >> (state & 7) & 1)
+
+    def accepts(self, word):
+        state = self.initial_state
+        if state < 0:
+            return False
+        class_of = self._class_of
+        if self.table is not None:
+            table = self.table
+            num_classes = self.num_classes
+            for char in word:
+                symbol = class_of.get(char)
+                if symbol is None:
+                    return False
+                state = table[state * num_classes + symbol]
+                if state < 0:
+                    return False
+        else:
+            row_ptr = self.row_ptr
+            symbols = self.symbols
+            targets = self.targets
+            for char in word:
+                symbol = class_of.get(char)
+                if symbol is None:
+                    return False
+                hi = row_ptr[state + 1]
+                i = bisect_left(symbols, symbol, row_ptr[state], hi)
+                if i == hi or symbols[i] != symbol:
+                    return False
+                state = targets[i]
+        return self.finals[state >> 3] >> (state & 7) & 1 == 1
+
+    def nbytes(self):
+        """
+        Memória ocupada pelos arrays do autômato, em bytes.
+        """
+        arrays = [self.classes, self.row_ptr, self.symbols, self.targets, self.table]
+        total = len(self.finals) + len(self.alphabet.encode("utf-8"))
+        for values in arrays:
+            if values is not None:
+                total += len(values) * values.itemsize
+        return total
+
+    def save(self, path):
+        """
+        Grava o autômato no formato binário: cabeçalho + alfabeto + arrays int32
+        (little-endian) + bitset de finais.
+        """
+        alphabet_bytes = self.alphabet.encode("utf-8")
+        if self.table is not None:
+            arrays = [self.classes, self.table]
+        else:
+            arrays = [self.classes, self.row_ptr, self.symbols, self.targets]
+        with open(path, "wb") as f:
+            f.write(
+                HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    LAYOUTS.index(self.layout),
+                    self.num_states,
+                    self.num_classes,
+                    self.initial_state,
+                    len(alphabet_bytes),
+                    len(self.symbols) if self.symbols is not None else 0,
+                )
+            )
+            f.write(alphabet_bytes)
+            f.write(self.finals)
+            for values in arrays:
+                if sys.byteorder == "big":
+                    values = array("i", values)
+                    values.byteswap()
+                f.write(values.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ValueError(f"Arquivo de autômato compacto inválido: {path}")
+        (
+            magic,
+            version,
+            layout,
+            num_states,
+            num_classes,
+            initial_state,
+            alphabet_size,
+            num_entries,
+        ) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or layout >= len(LAYOUTS):
+            raise ValueError(f"Arquivo de autômato compacto inválido: {path}")
+        offset = HEADER.size + alphabet_size
+        alphabet = data[HEADER.size : offset].decode("utf-8")
+        # classes tem uma entrada por caractere (não por byte) do alfabeto.
+        if LAYOUTS[layout] == "dense":
+            num_ints = len(alphabet) + num_states * num_classes
+        else:
+            num_ints = len(alphabet) + num_states + 1 + 2 * num_entries
+        expected_size = offset + _finals_size(num_states) + 4 * num_ints
+        if len(data) != expected_size:
+            raise ValueError(
+                f"Arquivo de autômato compacto com tamanho inconsistente: {path} "
+                f"tem {len(data)} bytes, o cabeçalho indica {expected_size}."
+            )
+        view = memoryview(data)
+        finals_size = _finals_size(num_states)
+        finals = bytearray(view[offset : offset + finals_size])
+        offset += finals_size
+
+        def read_int32(count):
+            nonlocal offset
+            values = _int32_array()
+            values.frombytes(view[offset : offset + count * values.itemsize])
+            if sys.byteorder == "big":
+                values.byteswap()
+            offset += count * values.itemsize
+            return values
+
+        classes = read_int32(len(alphabet))
+        if LAYOUTS[layout] == "dense":
+            return cls(
+                alphabet,
+                classes,
+                num_classes,
+                initial_state,
+                finals,
+                num_states,
+                table=read_int32(num_states * num_classes),
+            )
+        return cls(
+            alphabet,
+            classes,
+            num_classes,
+            initial_state,
+            finals,
+            num_states,
+            row_ptr=read_int32(num_states + 1),
+            symbols=read_int32(num_entries),
+            targets=read_int32(num_entries),
+        )
+
+
+def verify_round_trip(automaton, words, path):
+    """
+    Para cada layout, compila `automaton`, grava em `path`, recarrega e confere
+    arrays e respostas de `accepts` contra o `Automaton` original. Retorna a
+    lista de divergências (vazia se tudo bater).
+    """
+    problems = []
+    for layout in LAYOUTS:
+        compact = CompactAutomaton.from_automaton(automaton, layout=layout)
+        compact.save(path)
+        loaded = CompactAutomaton.load(path)
+        for field in (
+            "alphabet",
+            "classes",
+            "num_classes",
+            "initial_state",
+            "finals",
+            "num_states",
+            "row_ptr",
+            "symbols",
+            "targets",
+            "table",
+            "layout",
+        ):
+            if getattr(compact, field) != getattr(loaded, field):
+                problems.append(f"{layout}: campo '{field}' mudou ao recarregar")
+        for word in words:
+            expected = automaton.accepts(word)
+            if compact.accepts(word) != expected or loaded.accepts(word) != expected:
+                problems.append(f"{layout}: {word!r} diverge de Automaton.accepts")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("automato", help="Caminho para o arquivo .jff")
+    parser.add_argument("saida", help="Arquivo binário de saída (.cdfa)")
+    parser.add_argument(
+        "--layout", choices=("auto",) + LAYOUTS, default="auto", help="Layout"
+    )
+    parser.add_argument(
+        "--test", "-t", nargs="*", help="Senhas para testar com o autômato carregado"
+    )
+    parser.add_argument(
+        "--verificar",
+        "-v",
+        metavar="DICIONARIO",
+        help="Confere o round-trip gravar/carregar nos dois layouts com as senhas do dicionário",
+    )
+    args = parser.parse_args()
+
+    if args.verificar:
+        with open(args.verificar, "r", encoding="utf-8", errors="ignore") as f:
+            words = [line.strip() for line in f]
+        problems = verify_round_trip(parse_jff(args.automato), words, args.saida)
+        for problem in problems:
+            print(problem)
+        print(
+            f"Round-trip {'FALHOU' if problems else 'OK'} "
+            f"({len(words)} senhas, layouts {', '.join(LAYOUTS)})."
+        )
+        sys.exit(1 if problems else 0)
+
+    compact = CompactAutomaton.from_automaton(
+        parse_jff(args.automato), layout=args.layout
+    )
+    compact.save(args.saida)
+    print(
+        f"{compact.num_states} estados, {compact.num_classes} classes, "
+        f"layout {compact.layout}, {compact.nbytes()} bytes -> {args.saida}"
+    )
+    if args.test:
+        loaded = CompactAutomaton.load(args.saida)
+        for pwd in args.test:
+            ok = loaded.accepts(pwd)
+            print(f"{pwd!r} -> {'ACEITA' if ok else 'REJEITADA'}")
+
+
+if __name__ == "__main__":
+    main()
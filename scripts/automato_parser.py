@@ -3,6 +3,8 @@ import xml.etree.ElementTree as ET
 
 
 class State:
+    __slots__ = ("id", "name", "is_initial", "is_final")
+
     def __init__(self, id, name, is_initial=False, is_final=False):
         self.id = id
         self.name = name
@@ -11,6 +13,8 @@ class State:
 
 
 class Transition:
+    __slots__ = ("from_state", "to_state", "raw_read_symbol", "compiled_pattern")
+
     def __init__(self, from_state, to_state, read_symbol):
         self.from_state = from_state
         self.to_state = to_state
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+benchmark.py
+
+Suíte de benchmarks para os autômatos e os motores de ataque.
+
+Exemplos de Uso:
+    # Roda a suíte e grava os resultados em ../resultados/benchmarks/
+    python3 benchmark.py
+
+    # Grava os resultados atuais como baseline desta máquina
+    python3 benchmark.py --save-baseline
+
+    # Compara com o baseline e falha (código 1) se algo ficar >25% mais lento
+    python3 benchmark.py --baseline ../resultados/benchmarks/baseline.json --max-slowdown 0.25
+
+Cada benchmark roda para as três políticas (fraca, media, forte) com listas de
+palavras sintéticas de tamanho e semente fixos, geradas a partir do alfabeto
+do próprio autômato (a fração aceita vai em `accept_ratio`). Cada medição
+repete a carga até durar pelo menos MIN_SECONDS; a suíte inteira roda
+`--repeat` vezes e guarda a passada mais rápida de cada benchmark, e a
+comparação é feita por item/s. Os resultados vão para um JSON junto com
+metadados do ambiente (Python, SO, CPU, commit), para que comparações só sejam
+feitas entre execuções na mesma máquina.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+
+from ataque_dicionario import AtaqueDicionario
+from automato_compacto import CompactAutomaton
+from automato_parser import parse_jff
+from brute_force import CHARSET_FORTE, CHARSET_FRACA, CHARSET_MEDIA
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+AUTOMATA_DIR = REPO_DIR / "automatos"
+BENCHMARK_DIR = REPO_DIR / "resultados" / "benchmarks"
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+
+# Política -> (arquivo .jff, charset, comprimento mínimo)
+POLICIES = {
+    "fraca": ("fraca.jff", CHARSET_FRACA, 4),
+    "media": ("media.jff", CHARSET_MEDIA, 6),
+    "forte": ("forte.jff", CHARSET_FORTE, 8),
+}
+
+# Motores de aceitação disponíveis: nome -> função que recebe o autômato e
+# devolve um callable `accepts(word)`.
+ENGINES = {
+    "python": lambda automaton: automaton.accepts,
+    "compact": lambda automaton: CompactAutomaton.from_automaton(automaton).accepts,
+}
+
+HASH_ALGORITHMS = ("md5", "sha1", "sha256")
+
+SEED = 1234
+WORDLIST_SIZE = 10_000
+DICTIONARY_SIZE = 50_000
+BRUTE_FORCE_CANDIDATES = 50_000
+PARSE_REPEAT = 200
+SINGLE_WORD_REPEAT = 20_000
+REPEAT = 5
+# Duração mínima de cada medição: cargas mais curtas que isso ficam dominadas
+# por ruído do sistema e tornam o limite de lentidão inútil.
+MIN_SECONDS = 0.2
+# Passadas extras para confirmar uma regressão antes de falhar.
+CONFIRM_PASSES = 2
+
+
+def synthetic_wordlist(charset, size, seed=SEED, min_length=4, max_length=12):
+    """
+    Gera uma lista de palavras determinística (mesma semente, mesma lista).
+    """
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choices(charset, k=rng.randint(min_length, max_length)))
+        for _ in range(size)
+    ]
+
+
+def best_time(func, repeat=REPEAT, min_seconds=MIN_SECONDS):
+    """
+    Calibra quantas chamadas de `func` levam pelo menos `min_seconds`, mede
+    esse lote `repeat` vezes e retorna o menor tempo por chamada.
+    """
+    timer = timeit.Timer(func)
+    loops = 1
+    while True:
+        seconds = timer.timeit(loops)
+        if seconds >= min_seconds:
+            break
+        # Estima o número de chamadas que atinge a duração mínima (com folga).
+        loops = max(loops * 2, int(loops * 1.2 * min_seconds / max(seconds, 1e-9)))
+    best = seconds / loops
+    for _ in range(repeat - 1):
+        best = min(best, timer.timeit(loops) / loops)
+    return best
+
+
+def record(name, policy, engine, items, seconds, unit, accept_ratio=None):
+    result = {
+        "name": name,
+        "policy": policy,
+        "engine": engine,
+        "items": items,
+        "seconds": seconds,
+        "rate": items / seconds if seconds > 0 else 0.0,
+        "unit": unit,
+    }
+    if accept_ratio is not None:
+        result["accept_ratio"] = accept_ratio
+    return result
+
+
+def automaton_alphabet(automaton):
+    """
+    Caracteres que alguma transição do autômato aceita, para gerar palavras
+    que não sejam rejeitadas logo no primeiro caractere fora do alfabeto.
+    """
+    return CompactAutomaton.from_automaton(automaton).alphabet
+
+
+def bench_parse(policy, jff_path, repeat):
+    seconds = best_time(
+        lambda: [parse_jff(jff_path) for _ in range(PARSE_REPEAT)], repeat
+    )
+    return [record("parse_jff", policy, None, PARSE_REPEAT, seconds, "parses/s")]
+
+
+def bench_accepts(policy, automaton, words, repeat):
+    """
+    `accepts_single` usa a primeira palavra aceita (percorre o autômato até o
+    fim); `accepts_batch` usa a lista toda e registra a fração aceita.
+    """
+    results = []
+    accepted = [w for w in words if automaton.accepts(w)]
+    word = accepted[0] if accepted else words[0]
+    accept_ratio = len(accepted) / len(words)
+    for engine, make_accepts in ENGINES.items():
+        accepts = make_accepts(automaton)
+        seconds = best_time(
+            lambda: [accepts(word) for _ in range(SINGLE_WORD_REPEAT)], repeat
+        )
+        results.append(
+            record(
+                "accepts_single", policy, engine, SINGLE_WORD_REPEAT, seconds, "words/s"
+            )
+        )
+        seconds = best_time(lambda: [accepts(w) for w in words], repeat)
+        results.append(
+            record(
+                "accepts_batch",
+                policy,
+                engine,
+                len(words),
+                seconds,
+                "words/s",
+                accept_ratio=accept_ratio,
+            )
+        )
+    return results
+
+
+def spread_candidates(charset, length, count, seed=SEED):
+    """
+    Sorteia `count` candidatos de comprimento `length` uniformemente por todo
+    o espaço desse comprimento (sorteio determinístico pela semente).
+    """
+    rng = random.Random(seed)
+    return [tuple(rng.choices(charset, k=length)) for _ in range(count)]
+
+
+def bench_brute_force(
+    policy, automaton, charset, length, repeat, candidates=BRUTE_FORCE_CANDIDATES
+):
+    """
+    Mede candidatos/s do laço gerar+aceitar para candidatos de comprimento
+    `length`. Os candidatos são espalhados pelo espaço de busca: o prefixo da
+    enumeração repete sempre os mesmos primeiros caracteres e favorece quem
+    rejeita cedo, distorcendo a vazão.
+    """
+    sample = spread_candidates(charset, length, candidates)
+    accept_ratio = sum(automaton.accepts("".join(c)) for c in sample) / len(sample)
+    results = []
+    for engine, make_accepts in ENGINES.items():
+        accepts = make_accepts(automaton)
+
+        def run():
+            for candidate in sample:
+                accepts("".join(candidate))
+
+        seconds = best_time(run, repeat)
+        results.append(
+            record(
+                "brute_force",
+                policy,
+                engine,
+                candidates,
+                seconds,
+                "candidates/s",
+                accept_ratio=accept_ratio,
+            )
+        )
+    return results
+
+
+def bench_dictionary(policy, automaton, jff_path, charset, repeat):
+    words = synthetic_wordlist(charset, DICTIONARY_SIZE)
+    accept_ratio = sum(map(automaton.accepts, words)) / len(words)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dict_path = os.path.join(tmp_dir, f"sintetico_{policy}.txt")
+        with open(dict_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(words) + "\n")
+        megabytes = os.path.getsize(dict_path) / (1024 * 1024)
+        atacante = AtaqueDicionario(resultados_dir=tmp_dir)
+
+        def run():
+            # Silencia os prints do ataque para não poluir a saída do benchmark.
+            with contextlib.redirect_stdout(io.StringIO()):
+                atacante.executar_ataque(policy, dict_path, str(jff_path))
+
+        seconds = best_time(run, repeat)
+    return [
+        record(
+            "dictionary",
+            policy,
+            "python",
+            megabytes,
+            seconds,
+            "MB/s",
+            accept_ratio=accept_ratio,
+        )
+    ]
+
+
+def bench_hashing(policy, words, repeat):
+    encoded = [w.encode("utf-8") for w in words]
+    results = []
+    for algorithm in HASH_ALGORITHMS:
+        constructor = getattr(hashlib, algorithm)
+        seconds = best_time(lambda: [constructor(w).digest() for w in encoded], repeat)
+        results.append(
+            record("hashing", policy, algorithm, len(encoded), seconds, "hashes/s")
+        )
+    return results
+
+
+def run_suite_once(repeat=1):
+    results = []
+    for policy, (jff_file, charset, min_length) in POLICIES.items():
+        jff_path = AUTOMATA_DIR / jff_file
+        automaton = parse_jff(jff_path)
+        alphabet = automaton_alphabet(automaton)
+        words = synthetic_wordlist(alphabet, WORDLIST_SIZE)
+        results += bench_parse(policy, jff_path, repeat)
+        results += bench_accepts(policy, automaton, words, repeat)
+        results += bench_brute_force(policy, automaton, charset, min_length, repeat)
+        results += bench_dictionary(policy, automaton, jff_path, alphabet, repeat)
+        results += bench_hashing(policy, words, repeat)
+    return results
+
+
+def run_suite(repeat=REPEAT, best=None):
+    """
+    Roda a suíte inteira `repeat` vezes e guarda, para cada benchmark, a
+    passada mais rápida (acumulando sobre `best`, se dado). Intercalar as
+    repetições (em vez de repetir cada benchmark em sequência) evita que um
+    pico de carga da máquina contamine todas as medições de um mesmo benchmark.
+    """
+    best = dict(best or {})
+    for i in range(repeat):
+        print(f"Passada {i + 1}/{repeat}...")
+        for result in run_suite_once():
+            key = benchmark_key(result)
+            if key not in best or result["seconds"] < best[key]["seconds"]:
+                best[key] = result
+    return best
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment_metadata(repeat=REPEAT):
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "node": platform.node(),
+        "git_commit": git_commit(),
+        "seed": SEED,
+        "repeat": repeat,
+        "min_seconds": MIN_SECONDS,
+    }
+
+
+def benchmark_key(result):
+    engine = f"/{result['engine']}" if result["engine"] else ""
+    return f"{result['name']}[{result['policy']}{engine}]"
+
+
+def compare_with_baseline(current, baseline, max_slowdown):
+    """
+    Compara as taxas atuais com as do baseline. Retorna a lista de regressões
+    (benchmarks que ficaram mais lentos que `max_slowdown`, ex.: 0.25 = 25%).
+    """
+    if baseline["environment"].get("node") != current["environment"].get("node"):
+        print(
+            "Aviso: o baseline foi gerado em outra máquina; a comparação pode não ser significativa."
+        )
+    baseline_rates = {benchmark_key(r): r["rate"] for r in baseline["results"]}
+    regressions = []
+    print(f"{'benchmark':<40} {'baseline':>14} {'atual':>14} {'variação':>9}")
+    for result in current["results"]:
+        key = benchmark_key(result)
+        if key not in baseline_rates or result["rate"] <= 0:
+            continue
+        slowdown = baseline_rates[key] / result["rate"] - 1
+        flag = " <- REGRESSÃO" if slowdown > max_slowdown else ""
+        print(
+            f"{key:<40} {baseline_rates[key]:>14.1f} {result['rate']:>14.1f} {-slowdown:>+8.1%}{flag}"
+        )
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--out",
+        "-o",
+        help="Arquivo JSON de saída (default resultados/benchmarks/benchmark_<data>.json)",
+    )
+    parser.add_argument(
+        "--baseline",
+        "-b",
+        default=str(DEFAULT_BASELINE),
+        help="Arquivo JSON de baseline para comparação",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Grava os resultados atuais como novo baseline",
+    )
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=0.25,
+        help="Lentidão máxima tolerada em relação ao baseline (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=REPEAT,
+        help="Número de passadas da suíte (usa o melhor tempo de cada benchmark)",
+    )
+    args = parser.parse_args()
+
+    best = run_suite(args.repeat)
+    report = {
+        "environment": environment_metadata(args.repeat),
+        "results": list(best.values()),
+    }
+
+    BENCHMARK_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = args.out or BENCHMARK_DIR / (
+        f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print("Resultados salvos em", out_path)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print("Baseline salvo em", args.baseline)
+        return
+
+    if not Path(args.baseline).exists():
+        print("Nenhum baseline encontrado em", args.baseline, "- comparação ignorada.")
+        return
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(report, baseline, args.max_slowdown)
+    # Uma regressão só conta se persistir: passadas extras confirmam ou
+    # descartam lentidões causadas por picos de carga da máquina.
+    for _ in range(CONFIRM_PASSES):
+        if not regressions:
+            break
+        print(f"Confirmando {len(regressions)} regressão(ões) com mais uma passada...")
+        best = run_suite(1, best)
+        report["results"] = list(best.values())
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        regressions = compare_with_baseline(report, baseline, args.max_slowdown)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) acima da lentidão tolerada.")
+        sys.exit(1)
+    print("Nenhuma regressão acima da tolerância.")
+
+
+if __name__ == "__main__":
+    main()
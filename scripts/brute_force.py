@@ -5,6 +5,13 @@ import time
 
 import pandas as pd
 from automato_parser import Automaton, parse_jff
+from instrumentacao import Instrumentation, print_progress
+from previsao import describe_prediction, load_profile, predict_time_to_crack
+
+# Caracteres comuns para políticas de senha (minúsculas, maiúsculas, dígitos, símbolos)
+CHARSET_FRACA = "abcdefghijklmnopqrstuvwxyz0123456789"
+CHARSET_MEDIA = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+CHARSET_FORTE = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789!@#$%^&*()_+-=[]{}|;:,.<>?`~"
 
 
 def generate_brute_force_passwords(charset, max_length):
@@ -25,12 +32,24 @@ def run_brute_force_attack_target(
     max_length,
     target_password,
     time_limit_seconds=None,
+    instrumentation=None,
+    throughput_profile=None,
 ):
     """
     Executa a simulação de ataque de força bruta para encontrar uma senha alvo
     e coleta métricas detalhadas.
+
+    `instrumentation` (opcional) recebe uma `Instrumentation` já configurada
+    com callback/profiler; o limite de tempo e o espaço total são definidos aqui.
+    Com `throughput_profile` (ver calibracao.py), a estimativa de tempo de quebra
+    vem do preditor analítico em vez da velocidade observada nesta execução.
     """
-    automaton = parse_jff(automaton_file)
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+    instrumentation.time_limit_seconds = time_limit_seconds
+    instrumentation.start()
+    with instrumentation.phase("parse"):
+        automaton = parse_jff(automaton_file)
     total_passwords_tested = 0
     start_time = time.time()
     password_found_index = -1
@@ -42,6 +61,11 @@ def run_brute_force_attack_target(
     total_search_space = 0
     for length in range(min_length, max_length + 1):
         total_search_space += alphabet_size**length
+    # O gerador percorre todos os comprimentos a partir de 1 (os menores que
+    # min_length são filtrados), então o progresso é medido sobre esse total.
+    total_generated_space = sum(
+        alphabet_size**length for length in range(1, max_length + 1)
+    )
 
     viability_comment = "Viável para teste"
     if total_search_space > 10**8:  # Aprox. 100 milhões de senhas
@@ -57,23 +81,46 @@ def run_brute_force_attack_target(
         f"Charset: '{''.join(charset)}', Comprimento Min: {min_length}, Comprimento Max: {max_length}"
     )
 
+    instrumentation.total_candidates = total_generated_space
+    instrumentation.filtered_candidates = total_generated_space - total_search_space
+
+    # Contadores locais: o laço só fala com a instrumentação a cada
+    # `check_every` candidatos, mantendo o custo por candidato mínimo.
+    accepts = automaton.accepts
+    perf_counter = time.perf_counter
+    sample_every = instrumentation.sample_every
+    next_check = instrumentation.next_check
+    index = filtered = accepted = compared = 0
+    loop_start = perf_counter()
+
     for password, index in generate_brute_force_passwords(charset, max_length):
-        current_time = time.time()
-        duration_so_far = current_time - start_time
-        if time_limit_seconds is not None and duration_so_far > time_limit_seconds:
-            print(
-                f"Limite de tempo ({time_limit_seconds}s) atingido para o autômato "
-                f"{os.path.basename(automaton_file)} e senha alvo '{target_password}'."
-            )
-            attack_stopped_due_to_time_limit = True
-            total_passwords_tested = index  # Record passwords tested up to this point
-            break  # Stop the brute-force attempt
+        if index >= next_check:
+            # `index` ainda não foi processado: o checkpoint só conta os anteriores.
+            if instrumentation.checkpoint(index - 1, filtered, accepted, compared):
+                print(
+                    f"Limite de tempo ({time_limit_seconds}s) atingido para o autômato "
+                    f"{os.path.basename(automaton_file)} e senha alvo '{target_password}'."
+                )
+                attack_stopped_due_to_time_limit = True
+                total_passwords_tested = index  # Record passwords tested up to this point
+                break  # Stop the brute-force attempt
+            next_check = instrumentation.next_check
 
         if len(password) < min_length:
+            filtered += 1
             continue
 
         total_passwords_tested = index
-        if automaton.accepts(password):
+        if index % sample_every:
+            is_accepted = accepts(password)
+        else:
+            sample_start = perf_counter()
+            is_accepted = accepts(password)
+            instrumentation.sample("accept", perf_counter() - sample_start)
+
+        if is_accepted:
+            accepted += 1
+            compared += 1
             if password == target_password:
                 end_time = time.time()
                 duration_until_found = end_time - start_time
@@ -84,6 +131,14 @@ def run_brute_force_attack_target(
     # After the loop, calculate final duration and process results
     final_duration_of_attempt = time.time() - start_time
 
+    loop_seconds = perf_counter() - loop_start
+    generated = index - int(attack_stopped_due_to_time_limit)
+    instrumentation.update_counters(generated, filtered, accepted, compared)
+    instrumentation.finish()
+    accept_calls = generated - filtered
+    accept_seconds = instrumentation.extrapolate_samples({"accept": accept_calls})
+    instrumentation.add_phase_time("generate", max(loop_seconds - accept_seconds, 0.0))
+
     estimated_time_to_crack_total_seconds = "N/A"
     velocity_attempts_per_second = "N/A"
     final_viability_comment = viability_comment
@@ -114,8 +169,8 @@ def run_brute_force_attack_target(
                 # Justify inviability with estimation
                 final_viability_comment = (
                     f"Inviável (senha não encontrada no limite de tempo ou espaço de busca exaurido). "
-                    f"Estimativa de tempo para quebra: {estimated_time_to_crack_total_seconds / 3600:.2f} horas "
-                    f"({estimated_time_to_crack_total_seconds / (3600 * 24):.2f} dias). (Velocidade de {velocity_attempts_per_second:.2f} senhas/s)"
+                    f"Estimativa de tempo para quebra: {estimated_time_to_crack_total_seconds:.2f} s. "
+                    f"(Velocidade de {velocity_attempts_per_second:.2f} senhas/s)"
                 )
             else:  # Exhausted space, but password not found, or velocity zero
                 final_viability_comment = "Inviável (senha não encontrada após exaurir espaço ou limite de tempo)."
@@ -124,6 +179,27 @@ def run_brute_force_attack_target(
 
         is_viable_result = "Não"  # Explicitly not viable if not found
 
+    if throughput_profile is not None:
+        prediction = predict_time_to_crack(
+            throughput_profile,
+            os.path.splitext(os.path.basename(automaton_file))[0],
+            charset=charset,
+            min_length=min_length,
+            max_length=max_length,
+            target=target_password,
+        )
+        if prediction is not None:
+            estimated_time_to_crack_total_seconds = prediction["seconds_total"]
+            if password_found_index != -1:
+                final_viability_comment = (
+                    f"{viability_comment}. {describe_prediction(prediction)}"
+                )
+            else:
+                final_viability_comment = (
+                    f"Inviável (senha não encontrada no limite de tempo ou espaço de busca exaurido). "
+                    f"{describe_prediction(prediction)}"
+                )
+
     results = {
         "automaton": os.path.basename(automaton_file),
         "target_password": target_password,
@@ -161,6 +237,7 @@ def run_brute_force_attack_target(
         "viability_comment": final_viability_comment,
         "is_viable": is_viable_result,
     }
+    results.update(instrumentation.summary())
 
     return results
 
@@ -170,23 +247,22 @@ if __name__ == "__main__":
     OUTPUT_DIR = "../resultados"  # Alterado para "../resultados"
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    # Caracteres comuns para políticas de senha (minúsculas, maiúsculas, dígitos, símbolos)
-    charset_fraca = "abcdefghijklmnopqrstuvwxyz0123456789"
-    charset_media = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
-    charset_forte = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789!@#$%^&*()_+-=[]{}|;:,.<>?`~"
-
     time_limit_per_test_seconds = 60  # 1 minute limit for each test
+    # Perfil de vazão desta máquina (python3 calibracao.py); None se não calibrada
+    throughput_profile = load_profile()
 
     # Política Fraca: min 4, sem requisitos de caracteres, apenas minúsculas e dígitos
     # Senha alvo "abcd" - deve ser facilmente encontrada
     target_fraca = "ac12"
     results_fraca = run_brute_force_attack_target(
         os.path.join(AUTOMATA_DIR, "fraca.jff"),
-        charset_fraca,
+        CHARSET_FRACA,
         min_length=4,
         max_length=4,
         target_password=target_fraca,
         time_limit_seconds=time_limit_per_test_seconds,
+        instrumentation=Instrumentation(callback=print_progress),
+        throughput_profile=throughput_profile,
     )
     df_fraca = pd.DataFrame([results_fraca])
     output_path_fraca = os.path.join(
@@ -201,11 +277,13 @@ if __name__ == "__main__":
     target_media = "aA1aaa"
     results_media = run_brute_force_attack_target(
         os.path.join(AUTOMATA_DIR, "media.jff"),
-        charset_media,
+        CHARSET_MEDIA,
         min_length=6,
         max_length=6,
         target_password=target_media,
         time_limit_seconds=time_limit_per_test_seconds,
+        instrumentation=Instrumentation(callback=print_progress),
+        throughput_profile=throughput_profile,
     )
     df_media = pd.DataFrame([results_media])
     output_path_media = os.path.join(
@@ -220,11 +298,13 @@ if __name__ == "__main__":
     target_forte = "aA1!bbcc"
     results_forte = run_brute_force_attack_target(
         os.path.join(AUTOMATA_DIR, "forte.jff"),
-        charset_forte,
+        CHARSET_FORTE,
         min_length=8,
         max_length=8,
         target_password=target_forte,
         time_limit_seconds=time_limit_per_test_seconds,
+        instrumentation=Instrumentation(callback=print_progress),
+        throughput_profile=throughput_profile,
     )
     df_forte = pd.DataFrame([results_forte])
     output_path_forte = os.path.join(
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+calibracao.py
+
+Calibração de vazão por máquina e previsão analítica do tempo de quebra.
+
+Exemplos de Uso:
+    # Roda rajadas curtas de cada motor/hash e grava o perfil desta máquina
+    python3 calibracao.py
+
+    # Prevê o tempo de quebra sem rodar o ataque
+    python3 calibracao.py --prever --politica forte --min 8 --max 8 --alvo 'aA1!bbcc'
+    python3 calibracao.py --prever --politica media --mascara '?u?l?l?l?d?d' --alvo 'Abcd12'
+    python3 calibracao.py --prever --politica fraca --min 4 --max 6 --hash sha256
+
+A calibração mede, em rajadas de tamanho fixo, a vazão de geração dos
+candidatos curtos (comprimento mínimo - 1, que domina o trecho descartado),
+a vazão e a taxa de aceitação de cada motor por política e por comprimento
+(com candidatos espalhados pelo espaço de busca) e a vazão de cada algoritmo
+de hash. A previsão usa o tamanho exato de cada comprimento do espaço de busca
+(ou a posição exata da senha alvo na ordem de enumeração) dividido por essas
+vazões, em segundos.
+"""
+
+import argparse
+import itertools
+from pathlib import Path
+
+from automato_parser import parse_jff
+from benchmark import (
+    AUTOMATA_DIR,
+    ENGINES,
+    HASH_ALGORITHMS,
+    POLICIES,
+    bench_brute_force,
+    bench_hashing,
+    best_time,
+    environment_metadata,
+    synthetic_wordlist,
+)
+from previsao import (
+    PROFILE_PATH,
+    PROFILE_VERSION,
+    describe_prediction,
+    load_profile,
+    predict_time_to_crack,
+    save_profile,
+)
+
+BURST_SIZE = 20_000
+BURST_REPEAT = 3
+# Comprimentos calibrados por política, a partir do comprimento mínimo.
+CALIBRATED_LENGTHS = 3
+
+
+def calibrate(burst_size=BURST_SIZE, repeat=BURST_REPEAT):
+    """
+    Roda rajadas de `burst_size` candidatos de cada motor e retorna o perfil
+    de vazão (itens/s) desta máquina.
+    """
+    generate = {}
+    engines = {engine: {} for engine in ENGINES}
+    accept_ratio = {}
+    for policy, (jff_file, charset, min_length) in POLICIES.items():
+        if min_length > 1:
+            generate[policy] = _generate_rate(charset, min_length, burst_size, repeat)
+        automaton = parse_jff(AUTOMATA_DIR / jff_file)
+        accept_ratio[policy] = {}
+        for length in range(min_length, min_length + CALIBRATED_LENGTHS):
+            results = bench_brute_force(
+                policy, automaton, charset, length, repeat, candidates=burst_size
+            )
+            for result in results:
+                rates = engines[result["engine"]].setdefault(policy, {})
+                rates[str(length)] = result["rate"]
+                accept_ratio[policy][str(length)] = result["accept_ratio"]
+
+    _, forte_charset, forte_min_length = POLICIES["forte"]
+    words = synthetic_wordlist(
+        forte_charset, burst_size, min_length=forte_min_length, max_length=8
+    )
+    hashes = {
+        result["engine"]: result["rate"]
+        for result in bench_hashing("forte", words, repeat)
+    }
+
+    return {
+        "version": PROFILE_VERSION,
+        "environment": environment_metadata(repeat),
+        "burst_size": burst_size,
+        "generate": generate,
+        "engines": engines,
+        "accept_ratio": accept_ratio,
+        "hashes": hashes,
+    }
+
+
+def _generate_rate(charset, min_length, burst_size, repeat):
+    """
+    Vazão de geração + filtro de comprimento dos candidatos curtos que o
+    gerador enumera e descarta, medida no comprimento `min_length - 1` (o maior
+    e mais numeroso desses comprimentos).
+    """
+    length = min_length - 1
+    count = min(burst_size, len(charset) ** length)
+
+    def generate():
+        burst = itertools.islice(itertools.product(charset, repeat=length), count)
+        for password_tuple in burst:
+            password = "".join(password_tuple)
+            if len(password) < min_length:
+                continue
+
+    return count / best_time(generate, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--perfil",
+        "-p",
+        default=str(PROFILE_PATH),
+        help="Arquivo JSON do perfil de vazão",
+    )
+    parser.add_argument(
+        "--rajada",
+        type=int,
+        default=BURST_SIZE,
+        help="Candidatos por rajada de calibração",
+    )
+    parser.add_argument(
+        "--prever",
+        action="store_true",
+        help="Só prevê o tempo de quebra usando o perfil salvo",
+    )
+    parser.add_argument("--politica", choices=list(POLICIES), default="forte")
+    parser.add_argument("--charset", help="Charset (default: o da política)")
+    parser.add_argument("--min", type=int, help="Comprimento mínimo")
+    parser.add_argument("--max", type=int, help="Comprimento máximo")
+    parser.add_argument("--mascara", help="Máscara no estilo hashcat (ex.: ?u?l?d?d)")
+    parser.add_argument("--alvo", help="Senha alvo para prever a posição exata")
+    parser.add_argument("--hash", choices=HASH_ALGORITHMS, help="Hash do alvo")
+    parser.add_argument("--motor", choices=list(ENGINES), default="python")
+    args = parser.parse_args()
+
+    profile_path = Path(args.perfil)
+    if not args.prever:
+        print(f"Calibrando com rajadas de {args.rajada} candidatos...")
+        profile = calibrate(args.rajada)
+        save_profile(profile, profile_path)
+        print("Perfil de vazão salvo em", profile_path)
+        return
+
+    profile = load_profile(profile_path)
+    if profile is None:
+        print("Perfil não encontrado em", profile_path, "- rode a calibração antes.")
+        return
+    _, default_charset, default_min = POLICIES[args.politica]
+    min_length = args.min if args.min is not None else default_min
+    try:
+        prediction = predict_time_to_crack(
+            profile,
+            args.politica,
+            charset=args.charset or default_charset,
+            min_length=min_length,
+            max_length=args.max,
+            mask=args.mascara,
+            target=args.alvo,
+            engine=args.motor,
+            hash_algorithm=args.hash,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    if prediction is None:
+        print("O perfil não tem vazão para este motor/política; recalibre.")
+        return
+    print(describe_prediction(prediction))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+import cProfile
+import json
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+
+
+class JsonLinesSink:
+    """
+    Destino de eventos que grava cada evento de progresso como uma linha JSON.
+    Pode ser passado diretamente como `callback` para `Instrumentation`.
+
+    Use como gerenciador de contexto para garantir que o arquivo seja fechado:
+    `with JsonLinesSink(path) as sink: ...`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def __call__(self, event):
+        self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def print_progress(event):
+    """
+    Callback simples que imprime os eventos de progresso no terminal.
+    """
+    message = (
+        f"[{event['event']}] {event['counters']['generated']} candidatos em "
+        f"{event['elapsed_seconds']:.1f}s ({event['rate_per_second']:.0f}/s)"
+    )
+    if "percent_done" in event:
+        message += f", {event['percent_done']:.2f}% concluído"
+    if event.get("eta_seconds") is not None:
+        message += f", ETA {event['eta_seconds']:.1f}s"
+    elif event.get("eta_lower_bound_seconds") is not None:
+        message += f", ETA > {event['eta_lower_bound_seconds']:.1f}s"
+    print(message)
+
+
+class Instrumentation:
+    """
+    Instrumentação de baixo custo para os laços de ataque.
+
+    O laço mantém seus contadores em variáveis locais e só chama `checkpoint`
+    a cada `check_every` candidatos; é nesse momento que o prazo é verificado,
+    os contadores são sincronizados e, se houver callback, um evento de
+    progresso é emitido (no máximo um a cada `progress_interval_seconds`).
+    Fases por candidato (ex.: `accept`) são cronometradas por amostragem
+    (`sample`) e extrapoladas no final com `extrapolate_samples`.
+
+    `start` zera contadores, fases e amostras, então a mesma instância pode ser
+    reutilizada em vários ataques; chame-o antes de cronometrar qualquer fase.
+    Contadores que não se aplicam a um laço (ex.: `filtered` no ataque de
+    dicionário) podem ser omitidos e ficam em zero.
+
+    O ETA é calculado por segmento: os `filtered_candidates` curtos (que o
+    gerador enumera e descarta antes de `min_length`) e os demais candidatos
+    têm custos muito diferentes, então cada segmento restante é estimado com a
+    vazão observada nele. Enquanto nenhum candidato do segmento caro foi
+    testado, `eta_seconds` fica None e `eta_lower_bound_seconds` traz só o
+    tempo restante do segmento curto.
+    """
+
+    COUNTERS = ("generated", "filtered", "accepted", "compared")
+
+    def __init__(
+        self,
+        total_candidates=None,
+        filtered_candidates=0,
+        time_limit_seconds=None,
+        check_every=4096,
+        sample_every=64,
+        progress_interval_seconds=5.0,
+        callback=None,
+        profile=False,
+        profile_output=None,
+    ):
+        self.total_candidates = total_candidates
+        self.filtered_candidates = filtered_candidates
+        self.time_limit_seconds = time_limit_seconds
+        self.check_every = check_every
+        self.sample_every = sample_every
+        self.progress_interval_seconds = progress_interval_seconds
+        self.callback = callback
+        self.profile = profile
+        self.profile_output = profile_output
+
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.phase_seconds = {}
+        self._samples = {}
+        self._profiler = None
+        self.start_time = None
+        self._last_progress = None
+        self.next_check = check_every
+        self._reset_segments()
+
+    def start(self):
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.phase_seconds = {}
+        self._samples = {}
+        self.start_time = time.perf_counter()
+        self._last_progress = self.start_time
+        self.next_check = self.check_every
+        self._reset_segments()
+        self._last_account_time = self.start_time
+        if self.profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def _reset_segments(self):
+        self._last_account_time = None
+        self._last_generated = 0
+        self._last_filtered = 0
+        self.filtered_seconds = 0.0
+        self.tested_seconds = 0.0
+
+    def _account(self, now):
+        """
+        Atribui o tempo desde a última contabilização aos segmentos filtrado e
+        testado, proporcionalmente aos candidatos de cada um no intervalo (o
+        gerador percorre um segmento e depois o outro, então só o intervalo da
+        fronteira é misto).
+        """
+        delta_seconds = now - self._last_account_time
+        delta_filtered = self.counters["filtered"] - self._last_filtered
+        delta_generated = self.counters["generated"] - self._last_generated
+        if delta_generated > 0:
+            filtered_share = delta_filtered / delta_generated
+            self.filtered_seconds += delta_seconds * filtered_share
+            self.tested_seconds += delta_seconds * (1 - filtered_share)
+        self._last_account_time = now
+        self._last_generated = self.counters["generated"]
+        self._last_filtered = self.counters["filtered"]
+
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Cronometra um bloco inteiro (ex.: `parse`) e acumula em `phase_seconds`.
+        """
+        phase_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase_time(name, time.perf_counter() - phase_start)
+
+    def add_phase_time(self, name, seconds):
+        self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + seconds
+
+    def sample(self, name, seconds):
+        """
+        Registra a duração de uma chamada amostrada da fase `name`.
+        """
+        sample = self._samples.setdefault(name, [0.0, 0])
+        sample[0] += seconds
+        sample[1] += 1
+
+    def extrapolate_samples(self, calls_by_phase):
+        """
+        Converte as amostras em tempo estimado por fase, dado o número total de
+        chamadas de cada fase. Retorna a soma dos tempos estimados.
+        """
+        total = 0.0
+        for name, calls in calls_by_phase.items():
+            seconds, count = self._samples.get(name, (0.0, 0))
+            estimated = seconds / count * calls if count else 0.0
+            self.add_phase_time(name, estimated)
+            total += estimated
+        return total
+
+    def update_counters(self, generated, filtered=0, accepted=0, compared=0):
+        counters = self.counters
+        counters["generated"] = generated
+        counters["filtered"] = filtered
+        counters["accepted"] = accepted
+        counters["compared"] = compared
+
+    def checkpoint(self, generated, filtered=0, accepted=0, compared=0):
+        """
+        Sincroniza os contadores, emite progresso se for a hora e retorna True
+        quando o limite de tempo foi ultrapassado.
+        """
+        self.update_counters(generated, filtered, accepted, compared)
+        self.next_check = generated + self.check_every
+        now = time.perf_counter()
+        elapsed = now - self.start_time
+        self._account(now)
+        if (
+            self.callback is not None
+            and now - self._last_progress >= self.progress_interval_seconds
+        ):
+            self._last_progress = now
+            self.callback(self.progress_event(elapsed))
+        return self.time_limit_seconds is not None and elapsed > self.time_limit_seconds
+
+    def progress_event(self, elapsed, event="progress"):
+        generated = self.counters["generated"]
+        rate = generated / elapsed if elapsed > 0 else 0.0
+        result = {
+            "event": event,
+            "timestamp": time.time(),
+            "elapsed_seconds": elapsed,
+            "rate_per_second": rate,
+            "counters": dict(self.counters),
+        }
+        if self.total_candidates:
+            result["total_candidates"] = self.total_candidates
+            result["percent_done"] = 100 * generated / self.total_candidates
+            result.update(self._segment_eta())
+        return result
+
+    def _segment_eta(self):
+        filtered = self.counters["filtered"]
+        tested = self.counters["generated"] - filtered
+        filtered_rate = (
+            filtered / self.filtered_seconds if self.filtered_seconds > 0 else None
+        )
+        tested_rate = tested / self.tested_seconds if self.tested_seconds > 0 else None
+        remaining_filtered = max(self.filtered_candidates - filtered, 0)
+        remaining_tested = max(
+            self.total_candidates - self.filtered_candidates - tested, 0
+        )
+
+        def segment_seconds(remaining, rate):
+            if remaining == 0:
+                return 0.0
+            return remaining / rate if rate else None
+
+        filtered_eta = segment_seconds(remaining_filtered, filtered_rate)
+        tested_eta = segment_seconds(remaining_tested, tested_rate)
+        result = {
+            "filtered_rate_per_second": filtered_rate,
+            "tested_rate_per_second": tested_rate,
+            "eta_seconds": None,
+        }
+        if filtered_eta is not None and tested_eta is not None:
+            result["eta_seconds"] = filtered_eta + tested_eta
+        elif filtered_eta is not None:
+            result["eta_lower_bound_seconds"] = filtered_eta
+        return result
+
+    def finish(self):
+        """
+        Encerra a medição: para o profiler (se ativo) e emite o evento final.
+        Retorna o tempo total decorrido desde `start`.
+        """
+        now = time.perf_counter()
+        elapsed = now - self.start_time
+        self._account(now)
+        if self._profiler is not None:
+            self._profiler.disable()
+            if self.profile_output:
+                self._profiler.dump_stats(self.profile_output)
+            else:
+                pstats.Stats(self._profiler, stream=sys.stdout).sort_stats(
+                    "cumulative"
+                ).print_stats(20)
+            self._profiler = None
+        if self.callback is not None:
+            self.callback(self.progress_event(elapsed, event="finished"))
+        return elapsed
+
+    def summary(self):
+        """
+        Resumo plano (uma coluna por contador/fase) para anexar aos resultados CSV.
+        """
+        result = {f"candidates_{name}": value for name, value in self.counters.items()}
+        for name, seconds in self.phase_seconds.items():
+            result[f"phase_{name}_seconds"] = f"{seconds:.4f}"
+        return result
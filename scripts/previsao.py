@@ -0,0 +1,238 @@
+import json
+import string
+from pathlib import Path
+
+PROFILE_PATH = (
+    Path(__file__).resolve().parent.parent / "resultados" / "perfil_throughput.json"
+)
+# Versão do formato do perfil; perfis de outra versão precisam ser recalibrados.
+PROFILE_VERSION = 2
+
+# Classes de máscara no estilo hashcat (?l, ?u, ?d, ?s, ?a), na mesma ordem
+# de caracteres do hashcat: `?s` começa pelo espaço e segue a ordem ASCII, e
+# `?a` é ?l?u?d?s. É essa ordem que `mask_rank` usa para numerar os candidatos.
+MASK_CLASSES = {
+    "l": string.ascii_lowercase,
+    "u": string.ascii_uppercase,
+    "d": string.digits,
+    "s": " " + string.punctuation,
+}
+MASK_CLASSES["a"] = "".join(MASK_CLASSES.values())
+
+
+def save_profile(profile, path=PROFILE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2, ensure_ascii=False)
+
+
+def load_profile(path=PROFILE_PATH):
+    """
+    Carrega o perfil de vazão; retorna None se a máquina ainda não foi
+    calibrada ou se o perfil é de um formato antigo.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+    except FileNotFoundError:
+        return None
+    if profile.get("version") != PROFILE_VERSION:
+        return None
+    return profile
+
+
+def parse_mask(mask):
+    """
+    Converte uma máscara (ex.: '?u?l?l?d') na lista de charsets por posição.
+    Caracteres fora de '?x' são literais e '??' é um '?' literal. Levanta
+    ValueError para classes desconhecidas ou um '?' solto no final.
+    """
+    positions = []
+    i = 0
+    while i < len(mask):
+        if mask[i] == "?":
+            if i + 1 == len(mask):
+                raise ValueError(
+                    f"Máscara {mask!r} termina com '?' solto; use '??' para um '?' literal."
+                )
+            placeholder = mask[i + 1]
+            if placeholder == "?":
+                positions.append("?")
+            elif placeholder in MASK_CLASSES:
+                positions.append(MASK_CLASSES[placeholder])
+            else:
+                raise ValueError(
+                    f"Classe de máscara desconhecida '?{placeholder}' em {mask!r}; "
+                    f"use uma de {', '.join('?' + c for c in MASK_CLASSES)}."
+                )
+            i += 2
+        else:
+            positions.append(mask[i])
+            i += 1
+    return positions
+
+
+def keyspace(charset, min_length, max_length):
+    return sum(len(charset) ** length for length in range(min_length, max_length + 1))
+
+
+def mask_keyspace(positions):
+    total = 1
+    for charset in positions:
+        total *= len(charset)
+    return total
+
+
+def _mixed_radix_index(target, positions):
+    index = 0
+    for char, charset in zip(target, positions):
+        digit = charset.find(char)
+        if digit < 0:
+            return None
+        index = index * len(charset) + digit
+    return index
+
+
+def candidate_rank(target, charset):
+    """
+    Posição (a partir de 1) de `target` na ordem de `generate_brute_force_passwords`,
+    ou None se o alvo usa caracteres fora do charset.
+    """
+    index = _mixed_radix_index(target, [charset] * len(target))
+    if index is None:
+        return None
+    return keyspace(charset, 1, len(target) - 1) + index + 1
+
+
+def mask_rank(target, positions):
+    if len(target) != len(positions):
+        return None
+    index = _mixed_radix_index(target, positions)
+    return None if index is None else index + 1
+
+
+def _nearest_length(by_length, length):
+    """
+    Entrada de `by_length` (chaves são comprimentos em texto, como no JSON)
+    cujo comprimento é o mais próximo de `length`. Retorna (comprimento, valor).
+    """
+    nearest = min(by_length, key=lambda key: abs(int(key) - length))
+    return int(nearest), by_length[nearest]
+
+
+def _length_cost(rates, length):
+    """
+    Segundos por candidato de comprimento `length`, dadas as vazões medidas por
+    comprimento. Fora da faixa calibrada, o custo do comprimento medido mais
+    próximo é escalado proporcionalmente ao comprimento.
+    """
+    measured_length, rate = _nearest_length(rates, length)
+    return length / (measured_length * rate)
+
+
+def predict_time_to_crack(
+    profile,
+    policy,
+    charset=None,
+    min_length=1,
+    max_length=None,
+    mask=None,
+    target=None,
+    engine="python",
+    hash_algorithm=None,
+):
+    """
+    Prevê, em segundos, o tempo para exaurir o espaço de busca e (se `target`
+    for dado) para chegar à senha alvo. Usa `charset` com comprimentos
+    `min_length..max_length` (`max_length` padrão: `min_length`) ou uma
+    `mask`. Retorna None se o perfil não tem vazão para o motor/política
+    pedidos; levanta ValueError se não houver nem `mask` nem `charset` ou se
+    os comprimentos forem inválidos.
+
+    Cada comprimento é custeado com a vazão calibrada para ele. O hash só é
+    calculado para os candidatos que o autômato aceita (filtra e depois
+    hasheia), então seu custo é ponderado pela taxa de aceitação da política
+    medida na calibração; para máscaras, usa-se a taxa de aceitação da
+    política no comprimento da máscara.
+    """
+    if mask is None and not charset:
+        raise ValueError("Informe um charset (ou uma máscara) para a previsão.")
+    if max_length is None:
+        max_length = min_length
+    if min_length < 1:
+        raise ValueError(f"Comprimento mínimo deve ser >= 1 (recebido {min_length}).")
+    if max_length < min_length:
+        raise ValueError(
+            f"Comprimento máximo ({max_length}) menor que o mínimo ({min_length})."
+        )
+    rates = profile["engines"].get(engine, {}).get(policy)
+    generate_rate = profile["generate"].get(policy)
+    if not rates or (mask is None and min_length > 1 and not generate_rate):
+        return None
+    accept_ratios = profile["accept_ratio"].get(policy)
+    hash_rate = profile["hashes"][hash_algorithm] if hash_algorithm else None
+
+    def tested_cost(length):
+        seconds = _length_cost(rates, length)
+        if hash_rate is not None:
+            _, accept_ratio = _nearest_length(accept_ratios, length)
+            seconds += accept_ratio / hash_rate
+        return seconds
+
+    # Segmentos (quantidade de candidatos, segundos por candidato) na ordem de
+    # enumeração.
+    if mask is not None:
+        positions = parse_mask(mask)
+        space = mask_keyspace(positions)
+        segments = [(space, tested_cost(len(positions)))]
+        rank = mask_rank(target, positions) if target is not None else None
+    else:
+        # O gerador também enumera (e descarta) os comprimentos < min_length.
+        segments = [
+            (len(charset) ** length, 1 / generate_rate)
+            for length in range(1, min_length)
+        ]
+        segments += [
+            (len(charset) ** length, tested_cost(length))
+            for length in range(min_length, max_length + 1)
+        ]
+        space = keyspace(charset, min_length, max_length)
+        rank = candidate_rank(target, charset) if target is not None else None
+        if rank is not None and not min_length <= len(target) <= max_length:
+            rank = None
+
+    def seconds_until(position):
+        seconds = 0.0
+        for count, cost in segments:
+            taken = min(position, count)
+            seconds += taken * cost
+            position -= taken
+            if position == 0:
+                break
+        return seconds
+
+    prediction = {
+        "engine": engine,
+        "hash_algorithm": hash_algorithm,
+        "keyspace": space,
+        "seconds_total": seconds_until(sum(count for count, _ in segments)),
+        "target_rank": None,
+        "seconds_target": None,
+    }
+    if rank is not None:
+        prediction["target_rank"] = rank
+        prediction["seconds_target"] = seconds_until(rank)
+    return prediction
+
+
+def describe_prediction(prediction):
+    message = (
+        f"Estimativa (perfil calibrado): {prediction['seconds_total']:.2f} s para "
+        f"exaurir o espaço de {prediction['keyspace']} senhas"
+    )
+    if prediction["seconds_target"] is not None:
+        message += (
+            f"; {prediction['seconds_target']:.2f} s até a senha alvo "
+            f"(posição {prediction['target_rank']})"
+        )
+    return message + "."